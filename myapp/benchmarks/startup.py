@@ -0,0 +1,53 @@
+"""Import-to-ready latency of ``main.app``.
+
+Each run is a fresh interpreter that imports ``main`` and then enters the app
+lifespan, the same work a uvicorn worker does before accepting requests.
+
+    cd myapp && python -m benchmarks.startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def ready():
+    async with main.app.router.lifespan_context(main.app):
+        return time.perf_counter()
+
+ready_at = asyncio.run(ready())
+print(json.dumps({"import": imported - started, "ready": ready_at - started}))
+"""
+
+
+def run_once(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = {**os.environ, "ENV_STATE": os.environ.get("ENV_STATE", "test")}
+    samples = [run_once(env) for _ in range(args.runs)]
+    for key in ("import", "ready"):
+        values = [sample[key] * 1000 for sample in samples]
+        print(
+            f"{key:>6}: median {statistics.median(values):7.1f} ms"
+            f"  min {min(values):7.1f} ms  max {max(values):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
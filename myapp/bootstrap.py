@@ -0,0 +1,21 @@
+"""Create the database schema. Run once per deploy, before starting workers:
+
+    ENV_STATE=prod python bootstrap.py
+"""
+import logging
+
+from config import config
+from database import create_schema
+from logging_conf import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    configure_logging()
+    create_schema()
+    logger.info(f"Schema is up to date for {config.ENV_STATE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,11 +11,46 @@ class GlobalConfig(BaseConfig):
     DATABASE_URL : Optional[str] = None
     DB_FORCE_ROLL_BACK: bool = False
 
+    # Connection pool (asyncpg); DATABASE_URL may be postgresql+asyncpg://...
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_ACQUIRE_TIMEOUT: float = 10
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # SQLite profile: WAL + pragmas on pooled connections, one batching writer
+    SQLITE_PERFORMANCE_MODE: bool = False
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MAX_IDLE_CONNECTIONS: int = 8
+    SQLITE_WRITE_BATCH_SIZE: int = 64
+
+    # Production runs `python bootstrap.py` once per deploy instead
+    DB_CREATE_SCHEMA_ON_STARTUP: bool = False
+
+    # Password hashing runs in a worker pool so bcrypt never blocks the event loop
+    HASH_POOL_KIND: Literal["thread", "process"] = "thread"
+    HASH_POOL_SIZE: int = 4
+    HASH_MAX_CONCURRENCY: int = 8
+
+    # Users resolved by get_current_user, keyed by email. Set either to 0 to disable
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 60
+
+    # Verified JWT payloads, keyed by token digest and kept until the token's exp
+    TOKEN_CACHE_SIZE: int = 4096
+    TOKEN_CACHE_MAX_TTL_SECONDS: float = 3600
+
+    # Largest array accepted by the /tasks/bulk endpoints
+    TASK_BULK_MAX_ITEMS: int = 1000
+
 class DevConfig(GlobalConfig):
+    DB_CREATE_SCHEMA_ON_STARTUP: bool = True
     model_config = SettingsConfigDict(env_prefix="DEV_")
 
 class TestConfig(GlobalConfig):
     DATABASE_URL: str = "sqlite:///test.db"
+    DB_CREATE_SCHEMA_ON_STARTUP: bool = True
     model_config = SettingsConfigDict(env_prefix="TEST_")
 
 class ProdConfig(GlobalConfig):
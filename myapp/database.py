@@ -1,6 +1,12 @@
+import sqlite3
+from functools import lru_cache, partial
+from typing import Optional
+
 import databases
 import sqlalchemy
 from config import config
+from db_pool import MonitoredDatabase, PoolMonitor
+from db_sqlite import TunedSQLiteBackend, sqlite_pragmas
 
 metadata = sqlalchemy.MetaData()
 
@@ -22,14 +28,141 @@ tasks = sqlalchemy.Table(
     sqlalchemy.Column("end_date", sqlalchemy.DATETIME),
     sqlalchemy.Column("owner_id", sqlalchemy.ForeignKey("users.id"), nullable=False),
     sqlalchemy.CheckConstraint("status IN (0, 1, 2)", name="status_check"),
-    sqlalchemy.Index("idx_owner_status", "owner_id", "status")
+    sqlalchemy.Index("idx_owner_status", "owner_id", "status"),
+    # Keyset pagination seeks on (owner_id, id) or (owner_id, end_date, id)
+    sqlalchemy.Index("idx_owner_id", "owner_id", "id"),
+    sqlalchemy.Index("idx_owner_end_date", "owner_id", "end_date", "id")
 )
 
-engine = sqlalchemy.create_engine(
-    config.DATABASE_URL, connect_args={"check_same_thread": False}
-)
 
-metadata.create_all(engine)
-database = databases.Database(
-    config.DATABASE_URL, force_rollback=config.DB_FORCE_ROLL_BACK
-)
\ No newline at end of file
+@lru_cache()
+def fts5_available() -> bool:
+    # FTS5 is a compile-time option of the SQLite library Python links against
+    try:
+        with sqlite3.connect(":memory:") as conn:
+            conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(title)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def supports_returning() -> bool:
+    # INSERT/UPDATE ... RETURNING: SQLite 3.35+ and Postgres
+    if database.url.dialect == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 35, 0)
+    return database.url.dialect == "postgresql"
+
+
+SQLITE_SEARCH_INDEX = [
+    # External-content FTS5 table: stores only the index, rows live in tasks
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+       USING fts5(title, content='tasks', content_rowid='id')""",
+    # The triggers keep the index in sync with every write to tasks
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+         INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+         INSERT INTO tasks_fts(tasks_fts, rowid, title) VALUES ('delete', old.id, old.title);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title ON tasks BEGIN
+         INSERT INTO tasks_fts(tasks_fts, rowid, title) VALUES ('delete', old.id, old.title);
+         INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+       END""",
+]
+
+POSTGRES_SEARCH_INDEX = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_title_trgm ON tasks USING gin (title gin_trgm_ops)",
+]
+
+
+def create_search_index(engine: sqlalchemy.engine.Engine) -> None:
+    if engine.dialect.name == "sqlite":
+        if not fts5_available():
+            return
+        with engine.begin() as conn:
+            existed = conn.execute(
+                sqlalchemy.text("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'")
+            ).first()
+            for statement in SQLITE_SEARCH_INDEX:
+                conn.execute(sqlalchemy.text(statement))
+            # Index the rows that were written before the index existed
+            if not existed:
+                conn.execute(sqlalchemy.text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+    elif engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for statement in POSTGRES_SEARCH_INDEX:
+                conn.execute(sqlalchemy.text(statement))
+
+
+def database_options(url: str) -> dict:
+    # Extra keyword arguments for the databases backend of this dialect
+    if databases.DatabaseURL(url).dialect == "postgresql":
+        return {
+            "min_size": config.DB_POOL_MIN_SIZE,
+            "max_size": config.DB_POOL_MAX_SIZE,
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        }
+    return {}
+
+
+def create_db_engine(url: str) -> sqlalchemy.engine.Engine:
+    # The sync engine only manages the schema, so it never needs a real pool
+    db_url = sqlalchemy.engine.make_url(url)
+    if db_url.get_backend_name() == "sqlite":
+        return sqlalchemy.create_engine(db_url, connect_args={"check_same_thread": False})
+    # Async drivers cannot back a sync engine; use the dialect's default driver
+    if db_url.drivername in ("postgresql+asyncpg", "postgresql+aiopg"):
+        db_url = db_url.set(drivername="postgresql")
+    return sqlalchemy.create_engine(db_url, poolclass=sqlalchemy.pool.NullPool)
+
+
+def create_database(url: str) -> MonitoredDatabase:
+    dialect = databases.DatabaseURL(url).dialect
+    backend_class = None
+    write_batch_size = 0
+    if dialect == "sqlite" and config.SQLITE_PERFORMANCE_MODE:
+        # Tuned, reusable reader connections plus one batching writer
+        backend_class = partial(
+            TunedSQLiteBackend,
+            pragmas=sqlite_pragmas(
+                mmap_size=config.SQLITE_MMAP_SIZE,
+                cache_size_kib=config.SQLITE_CACHE_SIZE_KIB,
+                busy_timeout_ms=config.SQLITE_BUSY_TIMEOUT_MS,
+            ),
+            max_idle=config.SQLITE_MAX_IDLE_CONNECTIONS,
+        )
+        write_batch_size = config.SQLITE_WRITE_BATCH_SIZE
+
+    return MonitoredDatabase(
+        url,
+        force_rollback=config.DB_FORCE_ROLL_BACK,
+        pool_monitor=PoolMonitor(
+            # SQLite opens a connection per checkout, so it has no pool limit
+            max_size=config.DB_POOL_MAX_SIZE if dialect == "postgresql" else None,
+            acquire_timeout=config.DB_POOL_ACQUIRE_TIMEOUT,
+        ),
+        backend_class=backend_class,
+        write_batch_size=write_batch_size,
+        **database_options(url),
+    )
+
+
+@lru_cache()
+def get_engine() -> sqlalchemy.engine.Engine:
+    # Built on first use so importing this module never touches the database
+    return create_db_engine(config.DATABASE_URL)
+
+
+def create_schema(engine: Optional[sqlalchemy.engine.Engine] = None) -> None:
+    """Create missing tables, indexes and the search index.
+
+    Run once per deploy (``python bootstrap.py``) or from ``main.lifespan``
+    when ``DB_CREATE_SCHEMA_ON_STARTUP`` is set.
+    """
+    engine = engine or get_engine()
+    metadata.create_all(engine)
+    create_search_index(engine)
+
+
+database = create_database(config.DATABASE_URL)
\ No newline at end of file
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncGenerator, Callable, List, Optional
+
+import databases
+from databases.interfaces import ConnectionBackend, DatabaseBackend, TransactionBackend
+from sqlalchemy.sql import ClauseElement
+
+from db_writer import WriteQueue
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PoolMonitor:
+    """Tracks how many pooled connections are checked out and waited for."""
+
+    def __init__(self, max_size: Optional[int] = None, acquire_timeout: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.acquire_seconds = 0.0
+        self.raw_pool: Any = None
+
+    def stats(self) -> dict:
+        stats = {
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "waiting": self.waiting,
+            "acquired_total": self.acquired,
+            "acquire_timeouts_total": self.timeouts,
+            "acquire_seconds_total": self.acquire_seconds,
+            "max_size": self.max_size,
+            "saturation": self.in_use / self.max_size if self.max_size else None,
+        }
+        # asyncpg knows how many connections it has actually opened
+        if self.raw_pool is not None and hasattr(self.raw_pool, "get_size"):
+            stats["open"] = self.raw_pool.get_size()
+            stats["idle"] = self.raw_pool.get_idle_size()
+        return stats
+
+
+class MonitoredConnection(ConnectionBackend):
+    def __init__(self, connection: ConnectionBackend, monitor: PoolMonitor) -> None:
+        self._connection = connection
+        self._monitor = monitor
+
+    async def acquire(self) -> None:
+        monitor = self._monitor
+        started_at = time.perf_counter()
+        monitor.waiting += 1
+        try:
+            if monitor.acquire_timeout:
+                await asyncio.wait_for(self._connection.acquire(), monitor.acquire_timeout)
+            else:
+                await self._connection.acquire()
+        except asyncio.TimeoutError as e:
+            monitor.timeouts += 1
+            logger.warning(f"Timed out waiting for a database connection ({monitor.stats()})")
+            raise PoolTimeout("Timed out waiting for a database connection") from e
+        finally:
+            monitor.waiting -= 1
+            monitor.acquire_seconds += time.perf_counter() - started_at
+
+        monitor.acquired += 1
+        monitor.in_use += 1
+        monitor.peak_in_use = max(monitor.peak_in_use, monitor.in_use)
+
+    async def release(self) -> None:
+        self._monitor.in_use -= 1
+        await self._connection.release()
+
+    async def fetch_all(self, query: ClauseElement) -> List[Any]:
+        return await self._connection.fetch_all(query)
+
+    async def fetch_one(self, query: ClauseElement) -> Optional[Any]:
+        return await self._connection.fetch_one(query)
+
+    async def fetch_val(self, query: ClauseElement, column: Any = 0) -> Any:
+        return await self._connection.fetch_val(query, column)
+
+    async def execute(self, query: ClauseElement) -> Any:
+        return await self._connection.execute(query)
+
+    async def execute_many(self, queries: List[ClauseElement]) -> None:
+        await self._connection.execute_many(queries)
+
+    async def iterate(self, query: ClauseElement) -> AsyncGenerator[Any, None]:
+        async for record in self._connection.iterate(query):
+            yield record
+
+    def transaction(self) -> TransactionBackend:
+        return self._connection.transaction()
+
+    @property
+    def raw_connection(self) -> Any:
+        return self._connection.raw_connection
+
+
+class MonitoredBackend(DatabaseBackend):
+    """Wraps a databases backend so every connection checkout is counted."""
+
+    def __init__(self, backend: DatabaseBackend, monitor: PoolMonitor) -> None:
+        self._backend = backend
+        self.monitor = monitor
+
+    async def connect(self) -> None:
+        await self._backend.connect()
+        self.monitor.raw_pool = getattr(self._backend, "_pool", None)
+
+    async def disconnect(self) -> None:
+        await self._backend.disconnect()
+        self.monitor.raw_pool = None
+
+    def connection(self) -> MonitoredConnection:
+        return MonitoredConnection(self._backend.connection(), self.monitor)
+
+
+class MonitoredDatabase(databases.Database):
+    """``databases.Database`` that reports pool usage through ``self.pool``.
+
+    Writes should go through ``self.writer`` (see ``db_writer.WriteQueue``).
+    """
+
+    def __init__(
+        self,
+        url: Any,
+        *,
+        pool_monitor: Optional[PoolMonitor] = None,
+        backend_class: Optional[Callable[..., DatabaseBackend]] = None,
+        write_batch_size: int = 0,
+        **options: Any,
+    ) -> None:
+        super().__init__(url, **options)
+        if backend_class is not None:
+            self._backend = backend_class(self.url, **self.options)
+        self.pool = pool_monitor or PoolMonitor()
+        self._backend = MonitoredBackend(self._backend, self.pool)
+        self.writer = WriteQueue(self, batch_size=write_batch_size)
+
+    async def disconnect(self) -> None:
+        await self.writer.stop()
+        await super().disconnect()
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.sql import ClauseElement
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[Callable[[], Awaitable[Any]], asyncio.Future]
+
+
+class WriteQueue:
+    """Funnels database writes through one background task.
+
+    SQLite allows a single writer at a time, so instead of letting requests
+    race for the lock (and fail with "database is locked"), every write is
+    queued and a writer task runs them back to back. Jobs waiting in the
+    queue are committed together in one transaction, each inside its own
+    savepoint, so one fsync covers the whole batch and a failing job only
+    rolls back itself.
+
+    With ``batch_size=0`` the queue is disabled and jobs run directly in the
+    calling task, which is what every other backend uses.
+    """
+
+    def __init__(self, database: Any, batch_size: int = 0) -> None:
+        self.database = database
+        self.batch_size = batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.jobs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.batch_size > 0
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` as a write. Inside ``fn`` use ``database`` as usual."""
+        if not self.enabled:
+            return await fn()
+
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, future))
+        return await future
+
+    async def execute(self, query: ClauseElement) -> Any:
+        return await self.run(lambda: self.database.execute(query))
+
+    async def fetch_one(self, query: ClauseElement) -> Any:
+        # For INSERT/UPDATE ... RETURNING
+        return await self.run(lambda: self.database.fetch_one(query))
+
+    async def fetch_all(self, query: ClauseElement) -> List[Any]:
+        return await self.run(lambda: self.database.fetch_all(query))
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._worker(self._queue))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, queue = self._task, self._queue
+        self._task = self._queue = None
+        if task.get_loop() is not asyncio.get_running_loop():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        while not queue.empty():
+            _, future = queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Database writer stopped"))
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch: List[Job] = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._commit(batch)
+
+    async def _commit(self, batch: List[Job]) -> None:
+        outcomes = []
+        try:
+            async with self.database.transaction():
+                for fn, future in batch:
+                    # The client went away while this job was queued
+                    if future.done():
+                        continue
+                    try:
+                        async with self.database.transaction():
+                            outcomes.append((future, await fn(), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            logger.error(f"Write batch of {len(batch)} jobs failed to commit: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.jobs += len(batch)
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches_total": self.batches,
+            "jobs_total": self.jobs,
+            "avg_batch_size": self.jobs / self.batches if self.batches else 0.0,
+        }
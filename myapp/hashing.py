@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class HashingPool:
+    """Runs CPU-bound password hashing in a bounded worker pool.
+
+    At most ``max_concurrency`` calls are handed to the executor at once;
+    the rest wait on a semaphore, which is what ``queue_depth`` reports.
+    """
+
+    def __init__(self, kind: str = "thread", size: int = 4, max_concurrency: int = 8) -> None:
+        self.kind = kind
+        self.size = size
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.size)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.size, thread_name_prefix="hashing"
+                )
+            logger.debug(f"Started {self.kind} hashing pool with {self.size} workers")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # A semaphore is bound to the loop it is first used on, so build a new
+        # one whenever we are called from a different loop (e.g. between tests)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        semaphore = self._get_semaphore()
+        queued_at = time.perf_counter()
+
+        self.queue_depth += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        started_at = time.perf_counter()
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            finished_at = time.perf_counter()
+            self.in_flight -= 1
+            self.calls += 1
+            self.wait_seconds += started_at - queued_at
+            self.run_seconds += finished_at - started_at
+            self.max_run_seconds = max(self.max_run_seconds, finished_at - started_at)
+            semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "size": self.size,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "wait_seconds_total": self.wait_seconds,
+            "run_seconds_total": self.run_seconds,
+            "run_seconds_max": self.max_run_seconds,
+            "run_seconds_avg": self.run_seconds / self.calls if self.calls else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    kind=config.HASH_POOL_KIND,
+    size=config.HASH_POOL_SIZE,
+    max_concurrency=config.HASH_MAX_CONCURRENCY,
+)
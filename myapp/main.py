@@ -4,8 +4,12 @@ from contextlib import asynccontextmanager
 from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI, HTTPException
 from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import JSONResponse
 
-from database import database
+from config import config
+from database import create_schema, database
+from db_pool import PoolTimeout
+from hashing import hashing_pool
 from logging_conf import configure_logging
 from routers.user import router as user_router
 from routers.task import router as task_router
@@ -16,9 +20,12 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
+    if config.DB_CREATE_SCHEMA_ON_STARTUP:
+        create_schema()
     await database.connect()
     yield
     await database.disconnect()
+    hashing_pool.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -29,4 +36,9 @@ app.include_router(task_router)
 @app.exception_handler(HTTPException)
 async def http_exception_handle_logging(request, exc):
     logger.error(f"HTTPException: {exc.status_code} {exc.detail}")
-    return await http_exception_handler(request, exc)
\ No newline at end of file
+    return await http_exception_handler(request, exc)
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request, exc):
+    logger.error(f"Database pool exhausted: {database.pool.stats()}")
+    return JSONResponse(status_code=503, content={"detail": "Database is busy, try again"})
@@ -36,7 +36,18 @@ class TaskUpdate(BaseModel):
     status: Optional[TaskStatus] = None
     end_date: Optional[datetime] = None
 
-# 5. Full Task model (Output to user/Response)
+# 5. Model for one item of a bulk update
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+# 6. Per-item outcome of a bulk request, with an HTTP-style status code
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: int
+    detail: Optional[str] = None
+
+# 7. Full Task model (Output to user/Response)
 class Task(TaskBase):
     id: int
     owner_id: int
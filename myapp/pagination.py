@@ -0,0 +1,40 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(order_by: str, key: Tuple[Any, ...]) -> str:
+    # The cursor is opaque to clients: base64 of the sort key of the last row
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    raw = json.dumps({"o": order_by, "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> Tuple[Optional[datetime], int]:
+    """Return ``(end_date, id)`` for the row the cursor points at.
+
+    ``end_date`` is always ``None`` for cursors ordered by id.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if data["o"] != order_by:
+            raise InvalidCursor("Cursor was issued for a different ordering")
+        if order_by == "id":
+            (last_id,) = data["k"]
+            return None, int(last_id)
+        end_date, last_id = data["k"]
+        return (
+            datetime.fromisoformat(end_date) if end_date is not None else None,
+            int(last_id),
+        )
+    except InvalidCursor:
+        raise
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
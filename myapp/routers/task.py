@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, Query,HTTPException,status
-from database import tasks, database
+from fastapi import APIRouter, Body, Depends, Query,HTTPException,status, Response
+from sqlalchemy import and_, or_, select
+from config import config
+from database import tasks, database, supports_returning
+from pagination import InvalidCursor, decode_cursor, encode_cursor
+from search import apply_title_search
 from security import get_current_user
-from models.task import TaskCreate, TaskUpdate, Task, TaskStatus
-from typing import List, Optional
+from models.task import TaskCreate, TaskUpdate, TaskBulkUpdate, BulkItemResult, Task, TaskStatus
+from typing import List, Literal, Optional
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -13,34 +17,167 @@ async def create_task(payload: TaskCreate, current_user: dict = Depends(get_curr
         **payload.model_dump(), 
         owner_id=current_user["id"]
     )
-    last_record_id = await database.execute(query)
+    last_record_id = await database.writer.execute(query)
     return {**payload.model_dump(), "id": last_record_id, "owner_id": current_user["id"]}
 
+def keyset_condition(order_by: str, end_date, last_id: int):
+    # Rows strictly after (end_date, id) in "end_date NULLS FIRST, id" order
+    if order_by == "id":
+        return tasks.c.id > last_id
+    if end_date is None:
+        return or_(
+            and_(tasks.c.end_date.is_(None), tasks.c.id > last_id),
+            tasks.c.end_date.is_not(None),
+        )
+    return or_(
+        tasks.c.end_date > end_date,
+        and_(tasks.c.end_date == end_date, tasks.c.id > last_id),
+    )
+
 @router.get("/", response_model=List[Task])
 async def list_tasks(
+    response: Response,
     status_filter: Optional[TaskStatus] = Query(None, alias="status"),
     search: Optional[str] = Query(None, min_length=1, description="Search tasks by title"),
     limit: int = Query(10, gt=0, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor value from the previous page"),
+    order_by: Optional[Literal["id", "end_date", "relevance"]] = Query(
+        None, description="Defaults to relevance when searching, otherwise id"
+    ),
     current_user: dict = Depends(get_current_user)
 ):
     # 1. Base query: Always restricted to the current user
     query = tasks.select().where(tasks.c.owner_id == current_user["id"])
     
-    # 2. Search Logic (Case-insensitive title search)
+    # 2. Search Logic (Case-insensitive, prefix matching on every word)
+    # Served by the FTS5/trigram index, falling back to an ILIKE scan
+    relevance = None
     if search:
-        # ilike allows "Work" to match "work", "WORK", etc.
-        # The f"%{search}%" handles partial matches (e.g., "gro" matches "grocery")
-        query = query.where(tasks.c.title.ilike(f"%{search}%"))
+        query, relevance = apply_title_search(query, search)
+
+    if order_by is None:
+        order_by = "relevance" if relevance is not None else "id"
+    elif order_by == "relevance" and relevance is None:
+        order_by = "id"
     
     # 3. Status Filter Logic
     if status_filter is not None:
         query = query.where(tasks.c.status == status_filter)
     
     # 4. Pagination (Always last)
+    # Keyset mode seeks past the cursor on an index instead of scanning
+    # and discarding `offset` rows; old clients keep using limit/offset
+    if cursor is not None:
+        if order_by == "relevance":
+            raise HTTPException(status_code=400, detail="Cursors are not supported with relevance ordering")
+        if offset:
+            raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+        try:
+            last_end_date, last_id = decode_cursor(cursor, order_by)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        query = query.where(keyset_condition(order_by, last_end_date, last_id))
+
+    if order_by == "relevance":
+        query = query.order_by(relevance, tasks.c.id.asc())
+    elif order_by == "end_date":
+        query = query.order_by(tasks.c.end_date.asc().nulls_first(), tasks.c.id.asc())
+    else:
+        query = query.order_by(tasks.c.id.asc())
     query = query.limit(limit).offset(offset)
-    
-    return await database.fetch_all(query)
+
+    rows = await database.fetch_all(query)
+
+    # A full page may have more rows behind it
+    if len(rows) == limit and order_by != "relevance":
+        last = rows[-1]
+        key = (last["id"],) if order_by == "id" else (last["end_date"], last["id"])
+        response.headers["X-Next-Cursor"] = encode_cursor(order_by, key)
+
+    return rows
+
+def check_bulk_size(items: list) -> None:
+    if len(items) > config.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {config.TASK_BULK_MAX_ITEMS} items per request")
+
+async def owned_task_ids(ids: List[int], owner_id: int) -> set:
+    query = select(tasks.c.id).where(tasks.c.owner_id == owner_id).where(tasks.c.id.in_(ids))
+    return {row["id"] for row in await database.fetch_all(query)}
+
+@router.post("/bulk", response_model=List[BulkItemResult])
+async def create_tasks_bulk(payload: List[TaskCreate], current_user: dict = Depends(get_current_user)):
+    check_bulk_size(payload)
+    if not payload:
+        return []
+
+    rows = [{**item.model_dump(), "owner_id": current_user["id"]} for item in payload]
+
+    async def insert_rows():
+        async with database.transaction():
+            if supports_returning():
+                # One multi-row INSERT; ids are assigned in VALUES order
+                query = tasks.insert().values(rows).returning(tasks.c.id)
+                return sorted(row["id"] for row in await database.fetch_all(query))
+            return [await database.execute(tasks.insert().values(**row)) for row in rows]
+
+    ids = await database.writer.run(insert_rows)
+
+    return [BulkItemResult(index=index, id=task_id, status=201) for index, task_id in enumerate(ids)]
+
+@router.patch("/bulk", response_model=List[BulkItemResult])
+async def update_tasks_bulk(payload: List[TaskBulkUpdate], current_user: dict = Depends(get_current_user)):
+    check_bulk_size(payload)
+
+    async def apply_updates():
+        results = []
+        async with database.transaction():
+            owned = await owned_task_ids([item.id for item in payload], current_user["id"])
+
+            # Items making the same change share one UPDATE ... WHERE id IN (...)
+            groups: dict = {}
+            for index, item in enumerate(payload):
+                update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+                if item.id not in owned:
+                    results.append(BulkItemResult(index=index, id=item.id, status=404, detail="Task not found"))
+                elif not update_data:
+                    results.append(BulkItemResult(index=index, id=item.id, status=400, detail="No fields provided for update"))
+                else:
+                    groups.setdefault(tuple(sorted(update_data.items())), []).append(item.id)
+                    results.append(BulkItemResult(index=index, id=item.id, status=200))
+
+            for update_data, ids in groups.items():
+                query = (
+                    tasks.update()
+                    .where(tasks.c.owner_id == current_user["id"])
+                    .where(tasks.c.id.in_(ids))
+                    .values(**dict(update_data))
+                )
+                await database.execute(query)
+        return results
+
+    return await database.writer.run(apply_updates)
+
+@router.delete("/bulk", response_model=List[BulkItemResult])
+async def delete_tasks_bulk(ids: List[int] = Body(...), current_user: dict = Depends(get_current_user)):
+    check_bulk_size(ids)
+
+    async def delete_owned():
+        async with database.transaction():
+            owned = await owned_task_ids(ids, current_user["id"])
+            if owned:
+                query = tasks.delete().where(tasks.c.owner_id == current_user["id"]).where(tasks.c.id.in_(owned))
+                await database.execute(query)
+        return owned
+
+    owned = await database.writer.run(delete_owned)
+
+    return [
+        BulkItemResult(index=index, id=task_id, status=204)
+        if task_id in owned
+        else BulkItemResult(index=index, id=task_id, status=404, detail="Task not found")
+        for index, task_id in enumerate(ids)
+    ]
 
 @router.patch("/{task_id}", response_model=Task)
 async def update_task(
@@ -48,29 +185,38 @@ async def update_task(
     payload: TaskUpdate, 
     current_user: dict = Depends(get_current_user)
 ):
-    # Verify ownership and existence
-    check_query = tasks.select().where(tasks.c.id == task_id).where(tasks.c.owner_id == current_user["id"])
-    existing_task = await database.fetch_one(check_query)
-    
-    if not existing_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     update_data = payload.model_dump(exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields provided for update")
 
-    update_query = tasks.update().where(tasks.c.id == task_id).values(**update_data)
-    await database.execute(update_query)
-    
-    # Return the refreshed record
-    return await database.fetch_one(check_query)
+    # Ownership is part of the WHERE clause, so there is no separate check
+    # to race against and no rows affected means "not found"
+    update_query = (
+        tasks.update()
+        .where(tasks.c.id == task_id)
+        .where(tasks.c.owner_id == current_user["id"])
+        .values(**update_data)
+    )
+    async def update_and_select():
+        async with database.transaction():
+            if await database.execute(update_query):
+                return await database.fetch_one(tasks.select().where(tasks.c.id == task_id))
+
+    if supports_returning():
+        updated_task = await database.writer.fetch_one(update_query.returning(*tasks.c))
+    else:
+        updated_task = await database.writer.run(update_and_select)
+
+    if updated_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return updated_task
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(task_id: int, current_user: dict = Depends(get_current_user)):
     # The WHERE clause includes owner_id to prevent users from deleting others' tasks
     query = tasks.delete().where(tasks.c.id == task_id).where(tasks.c.owner_id == current_user["id"])
     
-    result = await database.execute(query)
+    result = await database.writer.execute(query)
     
     # result returns the number of rows deleted. If 0, it means the ID didn't exist for that user.
     if result == 0:
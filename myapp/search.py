@@ -0,0 +1,59 @@
+import re
+from typing import Optional, Tuple
+
+import sqlalchemy
+from sqlalchemy.sql import ColumnElement, Select
+
+from database import database, fts5_available, tasks
+
+# Lightweight handle on the FTS5 table created by database.create_search_index
+tasks_fts = sqlalchemy.table(
+    "tasks_fts", sqlalchemy.column("rowid"), sqlalchemy.column("rank")
+)
+
+
+def search_backend() -> Optional[str]:
+    dialect = database.url.dialect
+    if dialect == "sqlite" and fts5_available():
+        return "fts5"
+    if dialect == "postgresql":
+        return "trigram"
+    return None
+
+
+def search_terms(search: str) -> list[str]:
+    return re.findall(r"\w+", search)
+
+
+def fts5_query(terms: list[str]) -> str:
+    # Every term is quoted (no FTS operators from user input) and matched as a
+    # prefix; space-separated terms must all match
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def apply_title_search(
+    query: Select, search: str
+) -> Tuple[Select, Optional[ColumnElement]]:
+    """Restrict ``query`` to tasks whose title matches ``search``.
+
+    Returns the new query and, when the search index can score matches, an
+    ORDER BY clause putting the most relevant tasks first.
+    """
+    terms = search_terms(search)
+    backend = search_backend() if terms else None
+
+    if backend == "fts5":
+        query = query.select_from(
+            tasks.join(tasks_fts, tasks_fts.c.rowid == tasks.c.id)
+        ).where(sqlalchemy.text("tasks_fts MATCH :terms").bindparams(terms=fts5_query(terms)))
+        # FTS5 rank is bm25 where lower is better
+        return query, tasks_fts.c.rank.asc()
+
+    if backend == "trigram":
+        # Each ILIKE is served by the pg_trgm GIN index
+        for term in terms:
+            query = query.where(tasks.c.title.ilike(f"%{term}%"))
+        return query, sqlalchemy.func.similarity(tasks.c.title, search).desc()
+
+    # No index available: case-insensitive substring scan
+    return query.where(tasks.c.title.ilike(f"%{search}%")), None
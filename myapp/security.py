@@ -1,7 +1,11 @@
 import logging
 import bcrypt
 import datetime
+import time
+from cache import TTLCache
+from config import config
 from database import user_table, database
+from hashing import hashing_pool
 from fastapi import HTTPException, status, Depends
 from jose import jwt, JWTError, ExpiredSignatureError
 from typing import Literal, Annotated
@@ -16,6 +20,13 @@ SECRET_KEY = "9b73f2a1bdd7ae163444473d29a6885ffa22ab26117068f72a5a56a74d12d1fc"
 ALGORITHM = "HS256"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+user_cache = TTLCache(
+    maxsize=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL_SECONDS
+)
+token_cache = TTLCache(
+    maxsize=config.TOKEN_CACHE_SIZE, ttl=config.TOKEN_CACHE_MAX_TTL_SECONDS
+)
+
 def create_credentials_exception(detail: str) -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,6 +54,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     # .encode("utf-8") converts the stored string back to bytes for comparison
     return bcrypt.checkpw(password_pre_hash, hashed_password.encode("utf-8"))
 
+async def get_password_hash_async(password: str) -> str:
+    # bcrypt takes 100ms+ per call, so never run it on the event loop
+    return await hashing_pool.run(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
 def access_token_expire_minutes() -> int:
     return 30
 
@@ -71,18 +89,40 @@ async def get_user(email: str):
     if result:
         return result
 
+async def get_cached_user(email: str):
+    user = user_cache.get(email)
+    if user is None:
+        user = await get_user(email)
+        # Only found users are cached, so a new registration is visible at once
+        if user is not None:
+            user_cache.set(email, user)
+    return user
+
+def invalidate_user(email: str) -> None:
+    # Must be called after every write to the users table
+    user_cache.pop(email)
+
 async def authenticate_user(email: str, password: str):
     user = await get_user(email)
-    if not user or not verify_password(password, user.password):
+    if not user or not await verify_password_async(password, user.password):
         raise create_credentials_exception("Invalid email or password")
     if not user.confirmed:
         raise create_credentials_exception("User has not confirmed email")
     return user
 
 
-def get_subject_for_token_type(
-    token: str, type: Literal["access", "confirmation"]
-) -> str:
+def decode_token(token: str) -> dict:
+    # Clients reuse the same token for its whole lifetime, so remember the
+    # verified payload instead of re-checking the signature on every request
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        # Same rule as jose: expired once "exp" is strictly in the past
+        if payload["exp"] < int(time.time()):
+            token_cache.pop(digest)
+            raise create_credentials_exception("Token has expired")
+        return payload
+
     try:
         payload = jwt.decode(token, key=SECRET_KEY, algorithms=[ALGORITHM])
     except ExpiredSignatureError as e:
@@ -90,6 +130,16 @@ def get_subject_for_token_type(
     except JWTError as e:
         raise create_credentials_exception("Invalid token") from e
 
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(digest, payload, ttl=exp - time.time())
+    return payload
+
+def get_subject_for_token_type(
+    token: str, type: Literal["access", "confirmation"]
+) -> str:
+    payload = decode_token(token)
+
     email = payload.get("sub")
     if email is None:
         raise create_credentials_exception("Token is missing 'sub' field")
@@ -104,7 +154,7 @@ def get_subject_for_token_type(
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
     email = get_subject_for_token_type(token, "access")
-    user = await get_user(email=email)
+    user = await get_cached_user(email=email)
     if user is None:
         raise create_credentials_exception("Could Not find user for this token")
     return user
@@ -7,8 +7,13 @@ from fastapi.testclient import TestClient
 from httpx import AsyncClient,ASGITransport
 
 os.environ["ENV_STATE"] = "test"
-from myapp.database import database, user_table, tasks as task_table  # noqa: E402
+from myapp.database import create_schema, database, user_table, tasks as task_table  # noqa: E402
 from myapp.main import app  # noqa: E402
+from myapp import security  # noqa: E402
+
+# The app imports its modules top-level (``security``) while the tests go
+# through the package (``myapp.security``), so each copy has its own caches.
+import security as app_security  # noqa: E402
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -16,6 +21,12 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest_asyncio.fixture(scope="session", autouse=True)
+def schema():
+    # ASGITransport does not run the app lifespan, so build the schema here
+    create_schema()
+
+
 @pytest_asyncio.fixture()
 def client() -> Generator:
     yield TestClient(app)
@@ -82,4 +93,7 @@ async def clear_db():
     # This runs AFTER the test finishes
     await database.execute(user_table.delete())
     await database.execute(task_table.delete())
+    for module in (security, app_security):
+        module.user_cache.clear()
+        module.token_cache.clear()
     # await database.execute(task_table.delete())
@@ -113,4 +113,227 @@ async def test_delete_task(
         headers={"Authorization": f"Bearer {logged_in_token}"},
     )
 
-    assert response.status_code == 204
\ No newline at end of file
+    assert response.status_code == 204
+
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_pagination(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str
+):
+    for title in ("First", "Second", "Third"):
+        await create_task(title, async_client, logged_in_token)
+    headers = {"Authorization": f"Bearer {logged_in_token}"}
+
+    first_page = await async_client.get("/tasks/", headers=headers, params={"limit": 2})
+    cursor = first_page.headers["X-Next-Cursor"]
+    second_page = await async_client.get(
+        "/tasks/", headers=headers, params={"limit": 2, "cursor": cursor}
+    )
+
+    assert [t["title"] for t in first_page.json()] == ["First", "Second"]
+    assert [t["title"] for t in second_page.json()] == ["Third"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_pagination_by_end_date(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str
+):
+    headers = {"Authorization": f"Bearer {logged_in_token}"}
+    for title, end_date in (
+        ("Later", "2030-01-02T00:00:00"),
+        ("No date", None),
+        ("Sooner", "2030-01-01T00:00:00"),
+    ):
+        await async_client.post(
+            "/tasks/", json={"title": title, "end_date": end_date}, headers=headers
+        )
+
+    titles = []
+    params = {"limit": 1, "order_by": "end_date"}
+    while True:
+        response = await async_client.get("/tasks/", headers=headers, params=params)
+        titles += [t["title"] for t in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert titles == ["No date", "Sooner", "Later"]
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_invalid_cursor(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str
+):
+    response = await async_client.get(
+        "/tasks/",
+        headers={"Authorization": f"Bearer {logged_in_token}"},
+        params={"cursor": "not-a-cursor"},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_matches_word_prefixes(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str
+):
+    for title in ("Buy groceries", "Write report", "Grocery list review"):
+        await create_task(title, async_client, logged_in_token)
+
+    response = await async_client.get(
+        "/tasks/",
+        headers={"Authorization": f"Bearer {logged_in_token}"},
+        params={"search": "groc"},
+    )
+
+    assert sorted(t["title"] for t in response.json()) == [
+        "Buy groceries",
+        "Grocery list review",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_requires_every_term(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str
+):
+    for title in ("Write report", "Review report", "Write tests"):
+        await create_task(title, async_client, logged_in_token)
+
+    response = await async_client.get(
+        "/tasks/",
+        headers={"Authorization": f"Bearer {logged_in_token}"},
+        params={"search": "report wri"},
+    )
+
+    assert [t["title"] for t in response.json()] == ["Write report"]
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_updates_and_deletes(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str
+):
+    headers = {"Authorization": f"Bearer {logged_in_token}"}
+    renamed = await create_task("Old name", async_client, logged_in_token)
+    deleted = await create_task("Old task", async_client, logged_in_token)
+    await update_task(renamed["id"], {"title": "New name"}, async_client, logged_in_token)
+    await async_client.delete(f"/tasks/{deleted['id']}", headers=headers)
+
+    old = await async_client.get("/tasks/", headers=headers, params={"search": "old"})
+    new = await async_client.get("/tasks/", headers=headers, params={"search": "new"})
+
+    assert old.json() == []
+    assert [t["id"] for t in new.json()] == [renamed["id"]]
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str
+):
+    headers = {"Authorization": f"Bearer {logged_in_token}"}
+    response = await async_client.post(
+        "/tasks/bulk",
+        json=[{"title": "Bulk one"}, {"title": "Bulk two"}],
+        headers=headers,
+    )
+    listing = await async_client.get("/tasks/", headers=headers)
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()] == [201, 201]
+    assert {t["id"]: t["title"] for t in listing.json()} == {
+        response.json()[0]["id"]: "Bulk one",
+        response.json()[1]["id"]: "Bulk two",
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk_too_many_items(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str, mocker
+):
+    mocker.patch("config.config.TASK_BULK_MAX_ITEMS", 1)
+    response = await async_client.post(
+        "/tasks/bulk",
+        json=[{"title": "Bulk one"}, {"title": "Bulk two"}],
+        headers={"Authorization": f"Bearer {logged_in_token}"},
+    )
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_update_tasks_bulk(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str, created_task: dict
+):
+    headers = {"Authorization": f"Bearer {logged_in_token}"}
+    response = await async_client.patch(
+        "/tasks/bulk",
+        json=[
+            {"id": created_task["id"], "status": TaskStatus.DONE},
+            {"id": created_task["id"] + 100, "status": TaskStatus.DONE},
+            {"id": created_task["id"]},
+        ],
+        headers=headers,
+    )
+    listing = await async_client.get("/tasks/", headers=headers)
+
+    assert [r["status"] for r in response.json()] == [200, 404, 400]
+    assert listing.json()[0]["status"] == TaskStatus.DONE
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks_bulk(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str, created_task: dict
+):
+    headers = {"Authorization": f"Bearer {logged_in_token}"}
+    response = await async_client.request(
+        "DELETE",
+        "/tasks/bulk",
+        json=[created_task["id"], created_task["id"] + 100],
+        headers=headers,
+    )
+    listing = await async_client.get("/tasks/", headers=headers)
+
+    assert [r["status"] for r in response.json()] == [204, 404]
+    assert listing.json() == []
+
+
+@pytest.mark.asyncio
+async def test_update_task_returns_updated_row(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str, created_task: dict
+):
+    response = await async_client.patch(
+        f"/tasks/{created_task['id']}",
+        json={"title": "Renamed"},
+        headers={"Authorization": f"Bearer {logged_in_token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {**created_task, "title": "Renamed"}
+
+
+@pytest.mark.asyncio
+async def test_update_task_not_found(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str
+):
+    response = await async_client.patch(
+        "/tasks/999",
+        json={"title": "Renamed"},
+        headers={"Authorization": f"Bearer {logged_in_token}"},
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_task_without_returning(
+    async_client: AsyncClient, confirmed_user: dict, logged_in_token: str, created_task: dict, mocker
+):
+    mocker.patch("routers.task.supports_returning", return_value=False)
+    headers = {"Authorization": f"Bearer {logged_in_token}"}
+
+    updated = await async_client.patch(
+        f"/tasks/{created_task['id']}", json={"title": "Renamed"}, headers=headers
+    )
+    missing = await async_client.patch("/tasks/999", json={"title": "Renamed"}, headers=headers)
+
+    assert updated.json()["title"] == "Renamed"
+    assert missing.status_code == 404
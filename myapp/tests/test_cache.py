@@ -0,0 +1,51 @@
+from myapp.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_returns_value_until_ttl():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    timer.now = 5
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_set_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_set_ttl_override_is_capped():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+    cache.set("a", 1, ttl=100)
+
+    timer.now = 6
+    assert cache.get("a") is None
+
+
+def test_disabled_cache_never_stores():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import pytest
+
+from myapp.hashing import HashingPool
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result():
+    pool = HashingPool(size=1, max_concurrency=1)
+    assert await pool.run(sum, [1, 2, 3]) == 6
+    assert pool.stats()["calls"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_respects_concurrency_limit():
+    pool = HashingPool(size=4, max_concurrency=2)
+    peak = 0
+
+    def work():
+        nonlocal peak
+        peak = max(peak, pool.in_flight)
+        time.sleep(0.01)
+
+    await asyncio.gather(*(pool.run(work) for _ in range(6)))
+
+    stats = pool.stats()
+    assert peak <= 2
+    assert stats["calls"] == 6
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["run_seconds_max"] > 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_does_not_block_event_loop():
+    pool = HashingPool(size=1, max_concurrency=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    await asyncio.gather(pool.run(time.sleep, 0.05), ticker())
+
+    assert ticks == 5
+    pool.shutdown()
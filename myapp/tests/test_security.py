@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from jose import jwt
 
@@ -41,6 +43,13 @@ def test_password_hashes():
     assert security.verify_password(password, hashed)
 
 
+@pytest.mark.asyncio
+async def test_password_hashes_async():
+    password = "password"
+    hashed = await security.get_password_hash_async(password)
+    assert await security.verify_password_async(password, hashed)
+    assert not await security.verify_password_async("wrong", hashed)
+
 
 def test_get_subject_for_token_type_valid_confirmation():
     email = "test@example.com"
@@ -76,6 +85,43 @@ def test_get_subject_for_token_type_expired(mocker):
     assert exc_info.value.detail == "Token has expired"
 
 
+def test_get_subject_for_token_type_uses_token_cache(mocker):
+    token = security.create_access_token("test@example.com")
+    security.get_subject_for_token_type(token, "access")
+
+    spy = mocker.spy(security.jwt, "decode")
+    assert (
+        security.get_subject_for_token_type(token, "access")
+        == "test@example.com"
+    )
+    spy.assert_not_called()
+
+
+def test_get_subject_for_token_type_cached_but_expired(mocker):
+    token = security.create_access_token("test@example.com")
+    security.get_subject_for_token_type(token, "access")
+
+    mocker.patch("myapp.security.time.time", return_value=time.time() + 3600)
+
+    with pytest.raises(security.HTTPException) as exc_info:
+        security.get_subject_for_token_type(token, "access")
+
+    assert exc_info.value.detail == "Token has expired"
+
+
+def test_get_subject_for_token_type_cached_wrong_type():
+    token = security.create_access_token("test@example.com")
+    security.get_subject_for_token_type(token, "access")
+
+    with pytest.raises(security.HTTPException) as exc_info:
+        security.get_subject_for_token_type(token, "confirmation")
+
+    assert (
+        exc_info.value.detail
+        == "Token has incorrect type, expected 'confirmation'"
+    )
+
+
 def test_get_subject_for_token_type_invalid_token():
     with pytest.raises(security.HTTPException) as exc_info:
         security.get_subject_for_token_type("invalid token", "access")
@@ -165,6 +211,30 @@ async def test_get_current_user(registered_user: dict):
     assert user.email == registered_user["email"]
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_uses_cache(registered_user: dict, mocker):
+    token = security.create_access_token(registered_user["email"])
+    await security.get_current_user(token)
+
+    spy = mocker.spy(security, "get_user")
+    user = await security.get_current_user(token)
+
+    assert user.email == registered_user["email"]
+    spy.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_user_forces_reload(registered_user: dict, mocker):
+    token = security.create_access_token(registered_user["email"])
+    await security.get_current_user(token)
+    security.invalidate_user(registered_user["email"])
+
+    spy = mocker.spy(security, "get_user")
+    await security.get_current_user(token)
+
+    spy.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_invalid_token():
     with pytest.raises(security.HTTPException):